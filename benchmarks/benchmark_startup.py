@@ -0,0 +1,80 @@
+"""
+Benchmark the startup time of the command-line interface.
+
+Run from the repository root:
+    python -m benchmarks.benchmark_startup
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def time_command(command, repeats):
+    """
+    Run a command several times and measure its wall-clock time.
+
+    Args:
+        command: Command to run, as a list of arguments.
+        repeats: Number of runs.
+
+    Returns:
+        List of durations in seconds.
+    """
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, capture_output=True)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def benchmark_startup(repeats=10):
+    """
+    Time the CLI for `--help`, for an empty input directory, and the bare cost of importing the pipeline.
+
+    Args:
+        repeats: Number of runs per command.
+
+    Returns:
+        Dictionary mapping each case to its list of durations in seconds.
+    """
+    results = {}
+    results["python (baseline)"] = time_command([sys.executable, "-c", "pass"], repeats)
+    results["cli --help"] = time_command(
+        [sys.executable, "-m", "src.cli", "--help"], repeats
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results["cli empty input"] = time_command(
+            [
+                sys.executable,
+                "-m",
+                "src.cli",
+                "--input_dir",
+                tmp_dir,
+                "--output_dir",
+                f"{tmp_dir}/output",
+                "--debug_dir",
+                f"{tmp_dir}/debug",
+            ],
+            repeats,
+        )
+    results["import src.pipeline"] = time_command(
+        [sys.executable, "-c", "import src.pipeline"], repeats
+    )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the CLI startup time.")
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    for case, durations in benchmark_startup(args.repeats).items():
+        print(
+            f"{case:<22} median {statistics.median(durations) * 1000:7.1f} ms,"
+            f" min {min(durations) * 1000:7.1f} ms"
+        )
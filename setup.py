@@ -13,12 +13,14 @@ setup(
     description="A Python library for document cleaning and text isolation.",
     author="Andrei-Robert Ghinea",
     license="MIT",
-    packages=find_packages(where="src"),
-    package_dir={"": "src"},
+    # The sources live in src/ and are installed as the document_cleaning package
+    packages=["document_cleaning"]
+    + [f"document_cleaning.{package}" for package in find_packages(where="src")],
+    package_dir={"document_cleaning": "src"},
     install_requires=requirements,
     entry_points={
         "console_scripts": [
-            "document-cleaning=document_cleaning.pipeline:main",
+            "document-cleaning=document_cleaning.cli:main",
         ],
     },
     classifiers=[
@@ -0,0 +1,269 @@
+import argparse
+import logging
+import os
+import shutil
+import sys
+
+# Only lightweight modules are imported at module level, so that `--help` and runs without input files
+# don't pay for loading OpenCV and the processors. The pipeline is imported once there is work to do.
+
+
+def parse_arguments(argv=None):
+    """
+    Parse command-line arguments.
+
+    Args:
+        argv: Arguments to parse, defaults to the process arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Document image processing pipeline.")
+    parser.add_argument(
+        "--input_dir",
+        type=str,
+        default="data/input",
+        help="Path to the input directory containing images.",
+    )
+    parser.add_argument(
+        "--file_list",
+        type=str,
+        default=None,
+        help="Text file with one image path per line ('-' for stdin), used instead of --input_dir.",
+    )
+    parser.add_argument(
+        "--output_dir",
+        type=str,
+        default="data/output",
+        help="Path to the output directory where processed images will be saved.",
+    )
+    parser.add_argument(
+        "--debug_dir",
+        type=str,
+        default="data/debug",
+        help="Path to the debug directory for saving intermediate results.",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Enable debug mode to save intermediate results.",
+    )
+    parser.add_argument(
+        "--bypass",
+        action="store_true",
+        help="Automatically bypass prompts for removing non-empty directories.",
+    )
+    parser.add_argument(
+        "--force_black_text",
+        action="store_true",
+        help="Force the text in the document to appear black (e.g., #0B1215).",
+    )
+    parser.add_argument(
+        "--highlight_text_regions",
+        action="store_true",
+        help="Highlight detected text regions with bounding boxes.",
+    )
+    parser.add_argument(
+        "--grayscale_output",
+        action="store_true",
+        help="With --force_black_text, save single-channel output instead of Obsidian black BGR.",
+    )
+    parser.add_argument(
+        "--export_text_regions",
+        type=str,
+        choices=["json", "npz"],
+        default=None,
+        help="Export text regions, a run-length encoded text mask and region crops for OCR.",
+    )
+    parser.add_argument(
+        "--detector_engine",
+        type=str,
+        choices=["lightness", "canny", "auto"],
+        default="lightness",
+        help="Document detection engine, 'auto' tries canny first and falls back to lightness when a quick "
+        "brightness/contrast test says it can separate the document.",
+    )
+    parser.add_argument(
+        "--multi_page",
+        action="store_true",
+        help="Detect every document in each image and save one output per page.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Maximum number of pages cleaned concurrently with --multi_page (default: 2).",
+    )
+    parser.add_argument(
+        "--memory_profile",
+        action="store_true",
+        help="Record the memory peaks of every step and save them next to the output.",
+    )
+    parser.add_argument(
+        "--memory_budget_mb",
+        type=float,
+        default=None,
+        help="Fail the run if an image's memory peak, as chosen by --memory_budget_kind, exceeds this "
+        "budget (enables --memory_profile).",
+    )
+    parser.add_argument(
+        "--memory_budget_kind",
+        type=str,
+        choices=["rss", "traced"],
+        default="rss",
+        help="Memory peak --memory_budget_mb applies to: the process resident set size (default, Linux "
+        "only, falls back to traced elsewhere) or the tracemalloc peak of the Python, NumPy and OpenCV "
+        "allocations.",
+    )
+    return parser.parse_args(argv)
+
+
+def read_file_list(file_list):
+    """
+    Read the image paths to process from a file list.
+
+    Args:
+        file_list: Path to a text file with one image path per line, or "-" for stdin. Empty lines and
+            lines starting with "#" are skipped.
+
+    Returns:
+        List of image paths.
+    """
+    if file_list == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(file_list) as f:
+            lines = f.read().splitlines()
+    lines = (line.strip() for line in lines)
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def find_name_collisions(input_paths):
+    """
+    Find the input images whose outputs would overwrite each other, i.e. those with the same file name
+    without extension.
+
+    Args:
+        input_paths: List of image paths.
+
+    Returns:
+        Dictionary mapping each colliding name to its image paths.
+    """
+    paths_by_name = {}
+    for path in input_paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        paths_by_name.setdefault(name, []).append(path)
+    return {name: paths for name, paths in paths_by_name.items() if len(paths) > 1}
+
+
+def main(argv=None):
+    """
+    Run the document cleaning pipeline from the command line.
+
+    Args:
+        argv: Command-line arguments, defaults to the process arguments.
+
+    Returns:
+        Exit code.
+    """
+    args = parse_arguments(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s.%(msecs)03d %(levelname)s %(module)s - %(funcName)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    # Directories
+    input_dir = args.input_dir
+    output_dir = args.output_dir
+    debug_dir = args.debug_dir
+
+    # Debug mode flag
+    debug_mode = args.debug
+
+    # Remove the debug directory if it exists
+    if os.path.exists(debug_dir):
+        logging.info(f"Removing existing debug directory: {debug_dir}")
+        shutil.rmtree(debug_dir)
+
+    # Check if output directory exists and contains files
+    if os.path.exists(output_dir) and os.listdir(output_dir):
+        if args.bypass:
+            user_input = "y"
+        else:
+            user_input = (
+                input(
+                    f"The output directory '{output_dir}' is not empty. Do you want to remove it? (y/n): "
+                )
+                .strip()
+                .lower()
+            )
+        if user_input == "y":
+            logging.info(f"Removing output directory: {output_dir}")
+            shutil.rmtree(output_dir)
+        else:
+            logging.error(f"Output directory '{output_dir}' must be empty to start.")
+            return 1
+
+    # Recreate the output and debug directories
+    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(debug_dir, exist_ok=True)
+
+    # Get all files to process, from the file list or the input directory
+    if args.file_list:
+        input_paths = read_file_list(args.file_list)
+    else:
+        input_paths = [
+            os.path.join(input_dir, f)
+            for f in os.listdir(input_dir)
+            if os.path.isfile(os.path.join(input_dir, f))
+        ]
+
+    # Outputs, debug images and profiles are named after the image, so names must be unique
+    collisions = find_name_collisions(input_paths)
+    for name, paths in collisions.items():
+        logging.error(f"Images {paths} would all be saved as '{name}'")
+    if collisions:
+        logging.error("Rename the colliding images or process them in separate runs.")
+        return 1
+
+    # Check if there are no files to process
+    over_budget = False
+    if not input_paths:
+        logging.info("No files detected in the input directory!")
+    else:
+        from .pipeline import process_image
+        from .utils.memory_profiling import MemoryBudgetExceeded
+
+        # Process all images
+        for input_path in input_paths:
+            logging.info(f"Processing {input_path}...")
+            try:
+                process_image(
+                    input_path,
+                    output_dir,
+                    debug=debug_mode,
+                    force_black_text=args.force_black_text,
+                    highlight_text_regions=args.highlight_text_regions,
+                    grayscale_output=args.grayscale_output,
+                    export_text_regions=args.export_text_regions,
+                    detector_engine=args.detector_engine,
+                    multi_page=args.multi_page,
+                    workers=args.workers,
+                    memory_profile=args.memory_profile,
+                    memory_budget_mb=args.memory_budget_mb,
+                    memory_budget_kind=args.memory_budget_kind,
+                    debug_dir=debug_dir,
+                )
+            except MemoryBudgetExceeded as e:
+                logging.error(f"Error processing {input_path}: {e}")
+                over_budget = True
+            except Exception as e:
+                logging.error(f"Error processing {input_path}: {e}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,28 @@
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 
-from src.processing.adaptive_thresholding import AdaptiveThresholder
-from src.processing.color_space_conversion import ColorSpaceConverter
-from src.processing.document_detection import DocumentDetector
-from src.processing.mask_filling import MaskFiller
-from src.processing.morphological_processing import MorphologicalProcessor
-from src.processing.noise_reduction import NoiseReducer
-from src.processing.text_highlighting import TextHighlighter
-from src.utils.io_operations import read_image, ensure_directory, save_image
+from .processing.adaptive_thresholding import AdaptiveThresholder
+from .processing.color_space_conversion import ColorSpaceConverter
+from .processing.detector_selection import create_document_detector
+from .processing.mask_filling import MaskFiller
+from .processing.morphological_processing import MorphologicalProcessor
+from .processing.noise_reduction import NoiseReducer
+from .processing.text_highlighting import TextHighlighter
+from .processing.text_region_export import TextRegionExporter
+from .utils.io_operations import read_image, ensure_directory, save_image
+from .utils.memory_profiling import (
+    MemoryBudgetExceeded,
+    MemoryProfiler,
+    memory_checkpoint,
+)
+
+# Pages cleaned concurrently by default, each one peaks above 100 MB and OpenCV already uses
+# several threads inside each call
+DEFAULT_PAGE_WORKERS = 2
+
+OUTPUT_SUFFIX = "_processed_cropped.png"
 
 
 def process_image(
@@ -17,6 +31,15 @@ def process_image(
     debug=False,
     force_black_text=False,
     highlight_text_regions=False,
+    grayscale_output=False,
+    export_text_regions=None,
+    detector_engine="lightness",
+    multi_page=False,
+    workers=None,
+    memory_profile=False,
+    memory_budget_mb=None,
+    memory_budget_kind="rss",
+    debug_dir="data/debug",
 ):
     """
     Process a single image through all preprocessing steps.
@@ -27,22 +50,207 @@ def process_image(
         debug: If True, saves intermediate results for debugging.
         force_black_text: If True, replaces text color with black instead of keeping the original.
         highlight_text_regions: If True, it highlights text regions.
+        grayscale_output: If True and force_black_text is set, saves the single-channel page as is
+            instead of expanding it back to Obsidian black BGR.
+        export_text_regions: If set to "json" or "npz", exports the text regions, a run-length
+            encoded text mask and the region crops from the warped page next to the output.
+        detector_engine: Document detection engine, "lightness", "canny" or "auto".
+        multi_page: If True, detects every document in the image and saves one output per page.
+        workers: Maximum number of pages cleaned concurrently in multi-page mode, defaults to
+            DEFAULT_PAGE_WORKERS.
+        memory_profile: If True, records the memory peaks of every step and sub-step and saves them
+            next to the output.
+        memory_budget_mb: If set, enables memory profiling and raises MemoryBudgetExceeded when the
+            memory peak of the image goes over this budget, after removing its outputs.
+        memory_budget_kind: Memory peak the budget applies to, "rss" (resident set size, falls back
+            to "traced" where it isn't available) or "traced" (tracemalloc).
+        debug_dir: Directory for the debug images, each image gets its own subdirectory.
+
+    Returns:
+        List of the saved output paths.
     """
-    # Read input image
-    logging.info(f"Reading image from {input_path}")
-    image = read_image(input_path)
     image_name = os.path.splitext(os.path.basename(input_path))[0]
 
     # Define a custom debug directory for the current image
-    debug_dir = os.path.join("data", "debug", image_name)
+    debug_dir = os.path.join(debug_dir, image_name)
     if debug:
         ensure_directory(debug_dir)
 
+    profiler = None
+    if memory_profile or memory_budget_mb is not None:
+        profiler = MemoryProfiler(
+            budget_mb=memory_budget_mb, budget_kind=memory_budget_kind
+        )
+        # tracemalloc is process-wide, so the pages of a profiled image are cleaned one at a time
+        workers = 1
+
+    with profiler.activate() if profiler else nullcontext():
+        output_paths = detect_and_process(
+            input_path,
+            output_dir,
+            image_name,
+            debug_dir,
+            detector_engine,
+            multi_page,
+            workers,
+            debug=debug,
+            force_black_text=force_black_text,
+            highlight_text_regions=highlight_text_regions,
+            grayscale_output=grayscale_output,
+            export_text_regions=export_text_regions,
+        )
+
+    if profiler:
+        profiler.save(os.path.join(output_dir, f"{image_name}_memory_profile.json"))
+        try:
+            profiler.check_budget()
+        except MemoryBudgetExceeded:
+            # Don't leave the outputs of an image that failed behind, only its memory profile
+            for output_path in output_paths:
+                remove_page_outputs(output_path)
+            raise
+    return output_paths
+
+
+def remove_page_outputs(output_path):
+    """
+    Remove a processed page and its text region export.
+
+    Args:
+        output_path: Path of the processed page, as returned by `process_page`.
+    """
+    logging.info(f"Removing {output_path} and its text region export")
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    TextRegionExporter.remove_outputs(
+        os.path.dirname(output_path),
+        os.path.basename(output_path)[: -len(OUTPUT_SUFFIX)],
+    )
+
+
+def detect_and_process(
+    input_path,
+    output_dir,
+    image_name,
+    debug_dir,
+    detector_engine,
+    multi_page,
+    workers,
+    debug=False,
+    force_black_text=False,
+    highlight_text_regions=False,
+    grayscale_output=False,
+    export_text_regions=None,
+):
+    """
+    Read an image, detect its document(s) and clean every page.
+
+    Args:
+        input_path: Path to the input image.
+        output_dir: Directory to save processed results.
+        image_name: Base name of the saved files.
+        debug_dir: Directory to save debug images.
+        detector_engine: Document detection engine, "lightness", "canny" or "auto".
+        multi_page: If True, detects every document in the image and saves one output per page.
+        workers: Maximum number of pages cleaned concurrently in multi-page mode, defaults to
+            DEFAULT_PAGE_WORKERS.
+        debug: If True, saves intermediate results for debugging.
+        force_black_text: If True, replaces text color with black instead of keeping the original.
+        highlight_text_regions: If True, it highlights text regions.
+        grayscale_output: If True and force_black_text is set, saves the single-channel page as is.
+        export_text_regions: If set to "json" or "npz", exports the text regions next to the output.
+
+    Returns:
+        List of the saved output paths.
+    """
+    # Read input image
+    logging.info(f"Reading image from {input_path}")
+    image = read_image(input_path)
+    memory_checkpoint("0_read_image", 0)
+
     # Step 1: Document Detection (Cropped A4 Image)
-    document_detector = DocumentDetector(debug=debug, debug_dir=debug_dir)
-    cropped_image, warping_rect = document_detector.detect_and_warp(
-        image, step_number=1
+    if not multi_page:
+        document_detector = create_document_detector(
+            detector_engine, debug=debug, debug_dir=debug_dir
+        )
+        pages = [document_detector.detect_and_warp(image, step_number=1)[0]]
+        del image
+        # Pop the page and pass explicit keywords (a ** call keeps its arguments alive on the caller's
+        # side), so that process_page holds the only reference and releases it after noise reduction
+        return [
+            process_page(
+                pages.pop(),
+                output_dir,
+                image_name,
+                debug_dir,
+                debug=debug,
+                force_black_text=force_black_text,
+                highlight_text_regions=highlight_text_regions,
+                grayscale_output=grayscale_output,
+                export_text_regions=export_text_regions,
+            )
+        ]
+
+    # Several documents per capture may be smaller than a single one filling the frame
+    document_detector = create_document_detector(
+        detector_engine, debug=debug, debug_dir=debug_dir, min_area_ratio=0.02
     )
+    pages = document_detector.detect_and_warp_all(image, step_number=1)
+    if not pages:
+        raise ValueError(f"No document found in {input_path}")
+    del image
+
+    # The remaining steps of each page are independent, and OpenCV releases the GIL
+    max_workers = min(workers or DEFAULT_PAGE_WORKERS, len(pages))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                process_page,
+                cropped_image,
+                output_dir,
+                f"{image_name}_page{i}",
+                os.path.join(debug_dir, f"page{i}"),
+                debug=debug,
+                force_black_text=force_black_text,
+                highlight_text_regions=highlight_text_regions,
+                grayscale_output=grayscale_output,
+                export_text_regions=export_text_regions,
+            )
+            for i, (cropped_image, _) in enumerate(pages, start=1)
+        ]
+        return [future.result() for future in futures]
+
+
+def process_page(
+    cropped_image,
+    output_dir,
+    page_name,
+    debug_dir,
+    debug=False,
+    force_black_text=False,
+    highlight_text_regions=False,
+    grayscale_output=False,
+    export_text_regions=None,
+):
+    """
+    Clean a warped document page (steps 2 to 9) and save the result.
+
+    Args:
+        cropped_image: Page warped to the A4 size.
+        output_dir: Directory to save processed results.
+        page_name: Base name of the saved files.
+        debug_dir: Directory to save debug images.
+        debug: If True, saves intermediate results for debugging.
+        force_black_text: If True, replaces text color with black instead of keeping the original.
+        highlight_text_regions: If True, it highlights text regions.
+        grayscale_output: If True and force_black_text is set, saves the single-channel page as is.
+        export_text_regions: If set to "json" or "npz", exports the text regions next to the output.
+
+    Returns:
+        Path of the saved page.
+    """
+    # The crops of the text region export are taken from the unprocessed page
+    warped_image = cropped_image if export_text_regions else None
 
     # Step 2: Noise Reduction
     noise_reducer = NoiseReducer(kernel_size=(5, 5), debug=debug, debug_dir=debug_dir)
@@ -67,8 +275,12 @@ def process_image(
     # Tried using connected components and contour filtering to remove black dots here, without succeeding...
 
     # Step 6: Mask Filling
+    # With black text the page is monochrome, so keep it as a single channel through steps 6 and 7
     mask_filler = MaskFiller(
-        force_black_text=force_black_text, debug=debug, debug_dir=debug_dir
+        force_black_text=force_black_text,
+        single_channel=force_black_text,
+        debug=debug,
+        debug_dir=debug_dir,
     )
     text_white_background = mask_filler.apply(cropped_image, final_mask, step_number=6)
 
@@ -76,9 +288,13 @@ def process_image(
     noise_reducer = NoiseReducer(kernel_size=(5, 5), debug=debug, debug_dir=debug_dir)
     blurred = noise_reducer.apply(text_white_background, step_number=7)
 
-    # Step 8: Text Highlighting
+    # Expand back to BGR only if the output needs colors
     final_image = blurred
-    if highlight_text_regions:
+    if mask_filler.single_channel and (highlight_text_regions or not grayscale_output):
+        final_image = mask_filler.expand_to_bgr(final_image)
+
+    # Step 8: Text Highlighting
+    if highlight_text_regions or export_text_regions:
         text_highlighter = TextHighlighter(
             min_area=100,
             max_area_ratio=0.1,
@@ -86,9 +302,31 @@ def process_image(
             debug=debug,
             debug_dir=debug_dir,
         )
-        final_image = text_highlighter.apply(final_image, final_mask, step_number=8)
+        text_regions = text_highlighter.find_text_regions(final_mask)
+        if highlight_text_regions:
+            final_image = text_highlighter.apply(
+                final_image, final_mask, step_number=8, regions=text_regions
+            )
+
+    # Step 9: Text Region Export
+    if export_text_regions:
+        exporter = TextRegionExporter(
+            export_format=export_text_regions, debug=debug, debug_dir=debug_dir
+        )
+        exporter.apply(
+            warped_image,
+            final_mask,
+            text_regions,
+            output_dir,
+            page_name,
+            step_number=9,
+        )
+        memory_checkpoint("9_text_region_export", 9)
+        del warped_image
 
     # Save the final result
-    final_output_path = os.path.join(output_dir, f"{image_name}_processed_cropped.png")
+    final_output_path = os.path.join(output_dir, f"{page_name}{OUTPUT_SUFFIX}")
     save_image(final_image, final_output_path)
+    memory_checkpoint("10_save_output", 10)
     logging.info(f"Processed cropped image saved at {final_output_path}")
+    return final_output_path
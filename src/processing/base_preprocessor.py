@@ -1,6 +1,7 @@
 import os
 
-from src.utils.io_operations import save_image
+from ..utils.io_operations import save_image
+from ..utils.memory_profiling import memory_checkpoint
 
 
 class Preprocessor:
@@ -19,13 +20,26 @@ class Preprocessor:
 
     def save_debug_image(self, image, step_name, step_number):
         """
-        Save an intermediate image if debug mode is enabled.
+        Save an intermediate image if debug mode is enabled, and mark the end of the step for memory
+        profiling.
 
         Args:
             image: The image to save.
             step_name: Name for the debug step.
             step_number: Step count in the pipeline.
         """
+        self.mark_step(step_name, step_number)
         if self.debug:
             debug_path = os.path.join(self.debug_dir, f"{step_number}_{step_name}.png")
             save_image(image, debug_path)
+
+    def mark_step(self, step_name, step_number):
+        """
+        Mark the end of a step for memory profiling. Steps that save a debug image are marked by
+        `save_debug_image`, steps without one (or with a debug-only image) call this directly.
+
+        Args:
+            step_name: Name for the step.
+            step_number: Step count in the pipeline.
+        """
+        memory_checkpoint(f"{step_number}_{step_name}", step_number)
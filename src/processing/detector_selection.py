@@ -0,0 +1,148 @@
+import logging
+
+import cv2
+import numpy as np
+
+from .document_detection import DocumentDetector
+from .edge_document_detection import EdgeDocumentDetector
+
+
+class AutoDocumentDetector(DocumentDetector):
+    """
+    Document detector that tries the edge-based engine first, and falls back to the lightness
+    engine when a quick brightness/contrast test on a thumbnail says it can separate the document.
+
+    On data/input the canny engine is faster and finds a valid document in every capture, so it
+    always goes first.
+    """
+
+    engine_name = "auto"
+
+    def __init__(
+        self,
+        max_bright_border_ratio=0.2,
+        min_contrast=60,
+        min_area_ratio=0.1,
+        debug=False,
+        debug_dir="data/debug",
+    ):
+        super().__init__(
+            min_area_ratio=min_area_ratio, debug=debug, debug_dir=debug_dir
+        )
+        self.max_bright_border_ratio = max_bright_border_ratio
+        self.min_contrast = min_contrast
+        self.engines = {
+            "canny": EdgeDocumentDetector(
+                min_area_ratio=min_area_ratio, debug=debug, debug_dir=debug_dir
+            ),
+            "lightness": DocumentDetector(
+                min_area_ratio=min_area_ratio, debug=debug, debug_dir=debug_dir
+            ),
+        }
+        self.last_engine = None
+
+    def choose_engines(self, image):
+        """
+        Choose the engines to try, in order.
+
+        The lightness threshold only works when the background around the document is dark and the
+        document is much brighter than it, otherwise it isn't worth running as a fallback.
+
+        Args:
+            image: Input image as a numpy array.
+
+        Returns:
+            Tuple of engine names, canny first.
+        """
+        # Nearest-neighbour sampling is enough for these statistics and much cheaper than area averaging
+        scale = 128 / image.shape[1]
+        thumbnail = cv2.resize(
+            image, None, fx=scale, fy=scale, interpolation=cv2.INTER_NEAREST
+        )
+        l = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2LAB)[:, :, 0]
+        height, width = l.shape
+        b = max(1, width // 16)
+        border = np.concatenate(
+            (l[:b].ravel(), l[-b:].ravel(), l[:, :b].ravel(), l[:, -b:].ravel())
+        )
+        center = l[height // 4 : 3 * height // 4, width // 4 : 3 * width // 4]
+
+        bright_border_ratio = np.mean(border > 150)
+        contrast = np.median(center) - np.median(border)
+        logging.info(
+            f"Bright border ratio {bright_border_ratio:.3f}, contrast {contrast:.1f}"
+        )
+        if (
+            bright_border_ratio <= self.max_bright_border_ratio
+            and contrast >= self.min_contrast
+        ):
+            return "canny", "lightness"
+        return ("canny",)
+
+    def find_quad(self, image, step_number=1, step_name="document_detection"):
+        names = self.choose_engines(image)
+        self.mark_step(f"{step_name}_engine_selection", step_number)
+        # If no engine finds a valid document, keep the first quadrilateral found, like a single engine
+        fallback = None
+        inside_step = 1
+        for name in names:
+            logging.info(f"Detecting the document with the {name} engine...")
+            quad, inside_step = self.engines[name].find_quad(
+                image, step_number, f"{step_name}_{name}"
+            )
+            if self.is_valid_quad(quad, image.shape):
+                self.last_engine = name
+                return quad, inside_step
+            logging.warning(f"The {name} engine didn't find a valid document")
+            if fallback is None and quad is not None:
+                fallback = name, quad, inside_step
+
+        if fallback is None:
+            self.last_engine = None
+            return None, inside_step
+        self.last_engine, quad, inside_step = fallback
+        return quad, inside_step
+
+    def find_quads(self, image, step_number=1, step_name="document_detection"):
+        names = self.choose_engines(image)
+        self.mark_step(f"{step_name}_engine_selection", step_number)
+        quads, inside_step = [], 1
+        for name in names:
+            logging.info(f"Detecting documents with the {name} engine...")
+            quads, inside_step = self.engines[name].find_quads(
+                image, step_number, f"{step_name}_{name}"
+            )
+            self.last_engine = name
+            if quads:
+                break
+            logging.warning(f"The {name} engine didn't find any valid document")
+        return quads, inside_step
+
+
+DETECTOR_ENGINES = {
+    "lightness": DocumentDetector,
+    "canny": EdgeDocumentDetector,
+    "auto": AutoDocumentDetector,
+}
+
+
+def create_document_detector(
+    engine="lightness", debug=False, debug_dir="data/debug", **kwargs
+):
+    """
+    Create a document detector for the given engine.
+
+    Args:
+        engine: One of "lightness", "canny" or "auto".
+        debug: If True, saves intermediate images for debugging.
+        debug_dir: Directory to save debug images.
+        **kwargs: Extra arguments for the detector, e.g. min_area_ratio.
+
+    Returns:
+        A DocumentDetector instance.
+    """
+    if engine not in DETECTOR_ENGINES:
+        raise ValueError(
+            f"Unknown detector engine '{engine}', expected one of {list(DETECTOR_ENGINES)}"
+        )
+    return DETECTOR_ENGINES[engine](debug=debug, debug_dir=debug_dir, **kwargs)
@@ -3,12 +3,31 @@ import logging
 import cv2
 import numpy as np
 
-from src.processing.base_preprocessor import Preprocessor
+from .base_preprocessor import Preprocessor
+
+# A4 size at 300 DPI
+A4_WIDTH, A4_HEIGHT = 2480, 3508
 
 
 class DocumentDetector(Preprocessor):
-    def __init__(self, debug=False, debug_dir="data/debug"):
+    """
+    Document detector based on thresholding the lightness channel.
+
+    Other detection engines subclass this and override `find_quad`, the warping is shared.
+    """
+
+    engine_name = "lightness"
+
+    def __init__(
+        self,
+        min_area_ratio=0.1,
+        max_area_ratio=0.98,
+        debug=False,
+        debug_dir="data/debug",
+    ):
         super().__init__(debug, debug_dir)
+        self.min_area_ratio = min_area_ratio
+        self.max_area_ratio = max_area_ratio
 
     def detect_and_warp(self, image, step_number=1, step_name="document_detection"):
         """
@@ -20,7 +39,205 @@ class DocumentDetector(Preprocessor):
             step_name: Name for the debug step.
 
         Returns:
-            Warped image with an A4 aspect ratio.
+            Warped image with an A4 aspect ratio, and the ordered corners of the document.
+        """
+        quad, inside_step = self.find_quad(image, step_number, step_name)
+        if quad is None:
+            raise ValueError(f"No document found by the {self.engine_name} detector")
+        return self.warp(image, quad, step_number, step_name, inside_step)
+
+    def detect_and_warp_all(self, image, step_number=1, step_name="document_detection"):
+        """
+        Detect every document in the image and warp each one to an A4 aspect ratio.
+
+        Args:
+            image: Input image as a numpy array.
+            step_number: Count of the debug step.
+            step_name: Name for the debug step.
+
+        Returns:
+            List of (warped image, ordered corners) tuples, largest document first. If no valid document
+            is found, the best candidate is warped instead, like `detect_and_warp` does.
+        """
+        quads, inside_step = self.find_quads(image, step_number, step_name)
+        logging.info(f"Found {len(quads)} documents")
+        return [
+            self.warp(image, quad, step_number, f"{step_name}_page{i}", inside_step)
+            for i, quad in enumerate(quads, start=1)
+        ]
+
+    def warp(self, image, quad, step_number, step_name, inside_step):
+        """
+        Warp the document delimited by a quadrilateral to the A4 size.
+
+        Args:
+            image: Input image as a numpy array.
+            quad: The 4 corners of the document.
+            step_number: Count of the debug step.
+            step_name: Name for the debug step.
+            inside_step: Debug sub-step to continue from.
+
+        Returns:
+            Warped image with an A4 aspect ratio, and the ordered corners of the document.
+        """
+        # Draw the approximated quadrilateral for debugging, in blue
+        if self.debug:
+            debug_image_quad = image.copy()
+            cv2.drawContours(debug_image_quad, [np.int32(quad)], -1, (255, 0, 0), 3)
+            self.save_debug_image(
+                debug_image_quad,
+                f"{step_name}_{inside_step}_approximated_quad",
+                step_number,
+            )
+        else:
+            self.mark_step(f"{step_name}_{inside_step}_approximated_quad", step_number)
+        inside_step += 1
+
+        # Warp perspective using the approximated quadrilateral
+        rect = self.order_points(quad)  # Order the points consistently
+        dst = np.array(
+            [[0, 0], [A4_WIDTH, 0], [A4_WIDTH, A4_HEIGHT], [0, A4_HEIGHT]],
+            dtype="float32",
+        )
+        matrix = cv2.getPerspectiveTransform(rect, dst)
+        warped = cv2.warpPerspective(image, matrix, (A4_WIDTH, A4_HEIGHT))
+        self.save_debug_image(warped, f"{step_name}_{inside_step}_warped", step_number)
+
+        return warped, rect
+
+    def find_quad(self, image, step_number=1, step_name="document_detection"):
+        """
+        Find the corners of the document in the image.
+
+        Args:
+            image: Input image as a numpy array.
+            step_number: Count of the debug step.
+            step_name: Name for the debug step.
+
+        Returns:
+            The 4 corners of the document (or None if nothing was found), and the next debug sub-step.
+        """
+        contours, inside_step = self.find_white_contours(image, step_number, step_name)
+        if not contours:
+            return None, inside_step
+
+        # Step 5: Focus on the largest contour only
+        largest_contour = contours[0]
+
+        # Draw the largest contour for debugging, with green
+        if self.debug:
+            debug_image_contour = image.copy()
+            cv2.drawContours(debug_image_contour, [largest_contour], -1, (0, 255, 0), 3)
+            self.save_debug_image(
+                debug_image_contour,
+                f"{step_name}_{inside_step}_largest_contour",
+                step_number,
+            )
+        else:
+            self.mark_step(f"{step_name}_{inside_step}_largest_contour", step_number)
+        inside_step += 1
+
+        # Step 6: Approximate a quadrilateral from the contour
+        return self.approximate_quad(largest_contour), inside_step
+
+    def find_quads(self, image, step_number=1, step_name="document_detection"):
+        """
+        Find the corners of every document in the image.
+
+        Args:
+            image: Input image as a numpy array.
+            step_number: Count of the debug step.
+            step_name: Name for the debug step.
+
+        Returns:
+            List of non-overlapping document quadrilaterals (largest first), and the next debug
+            sub-step. Documents cut off by the image border are kept if they don't overlap a fully
+            visible one. If no candidate is a plausible document, the largest candidate is returned
+            alone, so no second detection is needed to fall back to a single document.
+        """
+        candidates, inside_step = self.find_candidate_quads(
+            image, step_number, step_name
+        )
+        quads, cut_off = [], []
+        for quad in candidates:
+            if not self.is_valid_quad(quad, image.shape):
+                cut_off.append(quad)
+                continue
+            # Skip quadrilaterals nested in an already accepted document
+            center = tuple(float(v) for v in np.mean(quad, axis=0))
+            if any(
+                cv2.pointPolygonTest(np.float32(q).reshape(-1, 1, 2), center, False)
+                >= 0
+                for q in quads
+            ):
+                logging.warning(
+                    f"Rejected a candidate document at {np.int32(quad).tolist()}: "
+                    "nested in another document"
+                )
+                continue
+            quads.append(quad)
+
+        visible = len(quads)
+        for quad in cut_off:
+            if not self.is_valid_quad(quad, image.shape, require_inside_frame=False):
+                logging.warning(
+                    f"Rejected a candidate document at {np.int32(quad).tolist()}: "
+                    "not a convex quadrilateral of plausible size"
+                )
+            elif any(self.quads_overlap(quad, q) for q in quads):
+                logging.warning(
+                    f"Rejected a candidate document at {np.int32(quad).tolist()}: "
+                    "touches the image border and overlaps another document"
+                )
+            else:
+                logging.info(
+                    f"Keeping a document cut off by the image border at {np.int32(quad).tolist()}"
+                )
+                quads.append(quad)
+        if len(quads) > visible:
+            quads.sort(
+                key=lambda q: cv2.contourArea(np.float32(q).reshape(-1, 1, 2)),
+                reverse=True,
+            )
+
+        if not quads and candidates:
+            logging.warning(
+                "No plausible document found, falling back to the largest candidate"
+            )
+            quads = candidates[:1]
+        return quads, inside_step
+
+    def find_candidate_quads(
+        self, image, step_number=1, step_name="document_detection"
+    ):
+        """
+        Find candidate document quadrilaterals, largest first. They are validated by `find_quads`.
+
+        Args:
+            image: Input image as a numpy array.
+            step_number: Count of the debug step.
+            step_name: Name for the debug step.
+
+        Returns:
+            List of quadrilaterals, and the next debug sub-step.
+        """
+        contours, inside_step = self.find_white_contours(image, step_number, step_name)
+        min_area = self.min_area_ratio * image.shape[0] * image.shape[1]
+        candidates = [
+            self.approximate_quad(contour)
+            for contour in contours
+            if cv2.contourArea(contour) >= min_area
+        ]
+        self.mark_step(f"{step_name}_{inside_step}_candidate_quads", step_number)
+        inside_step += 1
+        return candidates, inside_step
+
+    def find_white_contours(self, image, step_number, step_name):
+        """
+        Find the contours of the white regions in the image, largest first.
+
+        Returns:
+            List of contours, and the next debug sub-step.
         """
         inside_step = 1
         # Step 1: Convert to LAB color space to separate light regions
@@ -54,52 +271,64 @@ class DocumentDetector(Preprocessor):
         )
         contours = sorted(contours, key=cv2.contourArea, reverse=True)
         logging.info(f"Found {len(contours)} contours")
+        return contours, inside_step
 
-        # Step 5: Focus on the largest contour only
-        largest_contour = contours[0]
-
-        # Draw the largest contour for debugging, with green
-        debug_image_contour = image.copy()
-        cv2.drawContours(debug_image_contour, [largest_contour], -1, (0, 255, 0), 3)
-        self.save_debug_image(
-            debug_image_contour,
-            f"{step_name}_{inside_step}_largest_contour",
-            step_number,
-        )
-        inside_step += 1
-
-        # Step 6: Approximate a quadrilateral from the contour
-        perimeter = cv2.arcLength(largest_contour, True)
+    @staticmethod
+    def approximate_quad(contour):
+        """
+        Approximate a quadrilateral from a contour, falling back to its minimum area rectangle.
+        """
+        perimeter = cv2.arcLength(contour, True)
         epsilon = 0.02 * perimeter  # Adjust this value if needed
-        approx = cv2.approxPolyDP(largest_contour, epsilon, True)
+        approx = cv2.approxPolyDP(contour, epsilon, True)
 
         if len(approx) == 4:  # Valid quadrilateral found
-            quad = approx.reshape(4, 2)
-        else:  # Fallback to minimum area rectangle
-            rect = cv2.minAreaRect(largest_contour)
-            quad = cv2.boxPoints(rect)
-            quad = np.array(quad, dtype=int)
+            return approx.reshape(4, 2)
+        # Fallback to minimum area rectangle
+        rect = cv2.minAreaRect(contour)
+        return np.array(cv2.boxPoints(rect), dtype=int)
 
-        # Draw the approximated quadrilateral for debugging, in blue
-        debug_image_quad = image.copy()
-        cv2.drawContours(debug_image_quad, [np.int32(quad)], -1, (255, 0, 0), 3)
-        self.save_debug_image(
-            debug_image_quad,
-            f"{step_name}_{inside_step}_approximated_quad",
-            step_number,
-        )
-        inside_step += 1
+    def is_valid_quad(self, quad, image_shape, require_inside_frame=True):
+        """
+        Check if a quadrilateral is a plausible document: convex, neither tiny nor the whole frame, and not
+        touching the image border (the document should be fully visible).
 
-        # Step 7: Warp perspective using the approximated quadrilateral
-        rect = self.order_points(quad)  # Order the points consistently
-        dst = np.array(
-            [[0, 0], [2480, 0], [2480, 3508], [0, 3508]], dtype="float32"  # A4 size
+        Args:
+            quad: The 4 corners of the document, or None.
+            image_shape: Shape of the image the quad was found in.
+            require_inside_frame: If False, documents touching the image border are accepted too.
+
+        Returns:
+            True if the quadrilateral looks like a document.
+        """
+        if quad is None:
+            return False
+        contour = np.array(quad, dtype=np.float32).reshape(-1, 1, 2)
+        height, width = image_shape[:2]
+        area_ratio = cv2.contourArea(contour) / (height * width)
+        margin_x, margin_y = 0.005 * width, 0.005 * height
+        xs, ys = contour[:, 0, 0], contour[:, 0, 1]
+        inside_frame = (
+            xs.min() > margin_x
+            and ys.min() > margin_y
+            and xs.max() < width - 1 - margin_x
+            and ys.max() < height - 1 - margin_y
+        )
+        return bool(
+            (inside_frame or not require_inside_frame)
+            and cv2.isContourConvex(contour)
+            and self.min_area_ratio <= area_ratio <= self.max_area_ratio
         )
-        matrix = cv2.getPerspectiveTransform(rect, dst)
-        warped = cv2.warpPerspective(image, matrix, (2480, 3508))
-        self.save_debug_image(warped, f"{step_name}_{inside_step}_warped", step_number)
 
-        return warped, rect
+    @staticmethod
+    def quads_overlap(quad, other):
+        """
+        Check if two convex quadrilaterals overlap.
+        """
+        area, _ = cv2.intersectConvexConvex(
+            np.float32(quad).reshape(-1, 1, 2), np.float32(other).reshape(-1, 1, 2)
+        )
+        return area > 0
 
     @staticmethod
     def order_points(pts):
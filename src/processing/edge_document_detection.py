@@ -0,0 +1,113 @@
+import logging
+
+import cv2
+import numpy as np
+
+from .document_detection import DocumentDetector
+
+
+class EdgeDocumentDetector(DocumentDetector):
+    """
+    Document detector based on Canny edges, with CLAHE lighting normalization and a Hough line
+    fallback for documents whose edges are broken.
+
+    Detection runs on a downscaled copy of the image and the corners are scaled back.
+    """
+
+    engine_name = "canny"
+
+    def __init__(
+        self,
+        canny_thresholds=(50, 150),
+        detection_width=1000,
+        min_area_ratio=0.1,
+        max_area_ratio=0.98,
+        debug=False,
+        debug_dir="data/debug",
+    ):
+        super().__init__(min_area_ratio, max_area_ratio, debug, debug_dir)
+        self.canny_thresholds = canny_thresholds
+        self.detection_width = detection_width
+
+    def find_quad(self, image, step_number=1, step_name="document_detection"):
+        quads, inside_step = self.find_candidate_quads(
+            image, step_number, step_name, max_contours=10, first_only=True
+        )
+        return (quads[0] if quads else None), inside_step
+
+    def find_candidate_quads(
+        self,
+        image,
+        step_number=1,
+        step_name="document_detection",
+        max_contours=50,
+        first_only=False,
+    ):
+        inside_step = 1
+        # Step 1: Downscale, normalize the lighting with CLAHE and blur
+        scale = min(1.0, self.detection_width / image.shape[1])
+        small = cv2.resize(
+            image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+        )
+        l = cv2.cvtColor(small, cv2.COLOR_BGR2LAB)[:, :, 0]
+        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        l = cv2.GaussianBlur(clahe.apply(l), (5, 5), 0)
+        self.save_debug_image(
+            l, f"{step_name}_{inside_step}_normalized_lightness", step_number
+        )
+        inside_step += 1
+
+        # Step 2: Detect edges and close small gaps
+        edges = cv2.Canny(l, *self.canny_thresholds)
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+        edges = cv2.dilate(edges, kernel, iterations=2)
+        self.save_debug_image(edges, f"{step_name}_{inside_step}_edges", step_number)
+        inside_step += 1
+
+        # Step 3: Look for quadrilaterals among the edge contours
+        quads = self._find_edge_quads(edges, max_contours, first_only)
+        self.mark_step(f"{step_name}_{inside_step}_edge_quads", step_number)
+        inside_step += 1
+
+        # Step 4: Fallback to long Hough lines, to bridge broken document edges
+        if not quads:
+            logging.info("No quadrilateral in the edges, falling back to Hough lines")
+            min_length = 0.25 * min(edges.shape)
+            lines = cv2.HoughLinesP(
+                edges,
+                rho=1,
+                theta=np.pi / 180,
+                threshold=80,
+                minLineLength=min_length,
+                maxLineGap=min_length / 4,
+            )
+            lines_mask = np.zeros_like(edges)
+            if lines is not None:
+                for x1, y1, x2, y2 in lines[:, 0]:
+                    cv2.line(lines_mask, (x1, y1), (x2, y2), 255, 3)
+            quads = self._find_edge_quads(lines_mask, max_contours, first_only)
+            self.save_debug_image(
+                lines_mask, f"{step_name}_{inside_step}_hough_lines", step_number
+            )
+        inside_step += 1
+
+        return [(quad / scale).astype(np.float32) for quad in quads], inside_step
+
+    def _find_edge_quads(self, edges, max_contours, first_only):
+        """
+        Find convex quadrilaterals among the largest contours of an edge image, largest first.
+        """
+        contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+        contours = sorted(contours, key=cv2.contourArea, reverse=True)
+        logging.info(f"Found {len(contours)} edge contours")
+        quads = []
+        for contour in contours[:max_contours]:
+            hull = cv2.convexHull(contour)
+            approx = cv2.approxPolyDP(hull, 0.02 * cv2.arcLength(hull, True), True)
+            if len(approx) == 4 and self.is_valid_quad(
+                approx.reshape(4, 2), edges.shape
+            ):
+                quads.append(approx.reshape(4, 2))
+                if first_only:
+                    break
+        return quads
@@ -1,17 +1,44 @@
 import logging
 
 import cv2
+import numpy as np
 
-from src.processing.base_preprocessor import Preprocessor
+from .base_preprocessor import Preprocessor
+
+# Obsidian black (#0B1215) in BGR order
+OBSIDIAN_BGR = (11, 18, 21)
 
 
 class MaskFiller(Preprocessor):
-    def __init__(self, force_black_text=False, debug=False, debug_dir="data/debug"):
+    def __init__(
+        self,
+        force_black_text=False,
+        single_channel=False,
+        debug=False,
+        debug_dir="data/debug",
+    ):
+        """
+        Args:
+            force_black_text: If True, replaces text color with Obsidian black.
+            single_channel: If True (and force_black_text is set), keeps the filled page as a single
+                channel (0 = text, 255 = background) instead of a 3-channel image. Use `expand_to_bgr`
+                to get the Obsidian black BGR image back.
+        """
         super().__init__(debug, debug_dir)
         self.force_black_text = force_black_text
+        self.single_channel = single_channel and force_black_text
 
     def apply(self, cropped_image, mask, step_number):
         logging.info("Filling in the whites of the image...")
+        if self.single_channel:
+            logging.info("Replacing text with black on a single channel...")
+            # Pure white pixels stay white, everything else under the text mask becomes text
+            gray = cv2.cvtColor(cropped_image, cv2.COLOR_BGR2GRAY)
+            white = cv2.compare(gray, 255, cv2.CMP_EQ)
+            filled_image = cv2.bitwise_or(mask, white)
+            self.save_debug_image(filled_image, "mask_filling", step_number)
+            return filled_image
+
         inverted_mask = cv2.bitwise_not(mask)
         text_img = cv2.bitwise_and(cropped_image, cropped_image, mask=inverted_mask)
 
@@ -19,9 +46,34 @@ class MaskFiller(Preprocessor):
             logging.info("Replacing text with Obsidian black (#0B1215)...")
             gray_text = cv2.cvtColor(text_img, cv2.COLOR_BGR2GRAY)
             text_img = cv2.merge((gray_text, gray_text, gray_text))
-            text_img[gray_text < 255] = [11, 18, 21]
+            text_img[gray_text < 255] = OBSIDIAN_BGR
 
         filled_image = cv2.add(text_img, cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR))
         self.save_debug_image(filled_image, "mask_filling", step_number)
 
         return filled_image
+
+    @staticmethod
+    def expand_to_bgr(image, text_color=OBSIDIAN_BGR):
+        """
+        Expand a single-channel filled page into a BGR image.
+
+        Value 0 maps to `text_color` and 255 to white, with intermediate (blurred) values interpolated
+        linearly, which matches blurring the 3-channel image directly.
+
+        Args:
+            image: Single-channel image (0 = text, 255 = background).
+            text_color: BGR color used for the text.
+
+        Returns:
+            BGR image.
+        """
+        levels = np.arange(256, dtype=np.float32) / 255
+        lut = np.stack(
+            [np.round(c + (255 - c) * levels) for c in text_color], axis=-1
+        ).astype(np.uint8)
+        # Map the replicated channels through the per-channel table in place, so the BGR image is
+        # the only page-sized allocation
+        bgr = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        cv2.LUT(bgr, lut.reshape(256, 1, 3), dst=bgr)
+        return bgr
@@ -2,7 +2,7 @@ import logging
 
 import cv2
 
-from src.processing.base_preprocessor import Preprocessor
+from .base_preprocessor import Preprocessor
 
 
 class MorphologicalProcessor(Preprocessor):
@@ -2,8 +2,8 @@ import logging
 
 import cv2
 
-from src.processing.base_preprocessor import Preprocessor
-from src.utils.rectangle_merger import combine_rectangles
+from .base_preprocessor import Preprocessor
+from ..utils.rectangle_merger import combine_rectangles
 
 
 class TextHighlighter(Preprocessor):
@@ -20,9 +20,16 @@ class TextHighlighter(Preprocessor):
         self.max_area_ratio = max_area_ratio
         self.threshold = threshold
 
-    def apply(self, image, mask, step_number):
-        logging.info("Detecting and highlighting text regions...")
+    def find_text_regions(self, mask):
+        """
+        Find the merged text regions in a text mask.
+
+        Args:
+            mask: Binary mask with white background and black text.
 
+        Returns:
+            List of combined rectangles as (x, y, w, h).
+        """
         inverted_mask = cv2.bitwise_not(mask)
         num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(
             inverted_mask, connectivity=8
@@ -39,11 +46,17 @@ class TextHighlighter(Preprocessor):
             )
 
             if self.min_area <= area <= self.max_area_ratio * inverted_mask.size:
-                rectangles.append((x, y, w, h))
+                rectangles.append((int(x), int(y), int(w), int(h)))
+
+        return combine_rectangles(rectangles, self.threshold)
+
+    def apply(self, image, mask, step_number, regions=None):
+        logging.info("Detecting and highlighting text regions...")
 
-        combined_rectangles = combine_rectangles(rectangles, self.threshold)
+        if regions is None:
+            regions = self.find_text_regions(mask)
 
-        for x, y, w, h in combined_rectangles:
+        for x, y, w, h in regions:
             cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
 
         self.save_debug_image(image, "text_highlighting", step_number)
@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import shutil
+
+import cv2
+import numpy as np
+
+from .base_preprocessor import Preprocessor
+from ..utils.io_operations import ensure_directory
+from ..utils.run_length import rle_encode
+
+
+class TextRegionExporter(Preprocessor):
+    FORMATS = ("json", "npz")
+
+    def __init__(
+        self, export_format="json", save_crops=True, debug=False, debug_dir="data/debug"
+    ):
+        """
+        Export merged text regions in a structured form for downstream OCR.
+
+        Args:
+            export_format: "json" or "npz".
+            save_crops: If True, writes one PNG crop per region from the page.
+            debug: If True, saves intermediate images for debugging.
+            debug_dir: Directory to save debug images.
+        """
+        super().__init__(debug, debug_dir)
+        if export_format not in self.FORMATS:
+            raise ValueError(
+                f"Unknown export format '{export_format}', expected one of {self.FORMATS}"
+            )
+        self.export_format = export_format
+        self.save_crops = save_crops
+
+    @staticmethod
+    def crop_regions(image, regions):
+        """
+        Crop the regions out of the image as zero-copy views.
+
+        Args:
+            image: Image as a numpy array.
+            regions: List of rectangles as (x, y, w, h).
+
+        Returns:
+            List of numpy views into the image, one per region.
+        """
+        return [image[y : y + h, x : x + w] for x, y, w, h in regions]
+
+    def apply(self, image, mask, regions, output_dir, image_name, step_number):
+        """
+        Write the text regions, the run-length encoded text mask and the region crops.
+
+        Args:
+            image: Warped page the crops are taken from.
+            mask: Binary mask with white background and black text.
+            regions: List of merged rectangles as (x, y, w, h).
+            output_dir: Directory to write the export to.
+            image_name: Base name of the processed image.
+            step_number: Step count in the pipeline.
+
+        Returns:
+            Dictionary with "regions", "text_mask_rle" and "crops" (views into `image`).
+        """
+        logging.info(
+            f"Exporting {len(regions)} text regions as {self.export_format}..."
+        )
+        text_mask_rle = rle_encode(cv2.bitwise_not(mask))
+        regions_array = np.array(regions, dtype=np.int32).reshape(-1, 4)
+
+        output_prefix = os.path.join(output_dir, f"{image_name}_text_regions")
+        export_path = f"{output_prefix}.{self.export_format}"
+        if self.export_format == "json":
+            with open(export_path, "w") as f:
+                json.dump(
+                    {
+                        "image_size": [int(image.shape[0]), int(image.shape[1])],
+                        "regions": regions_array.tolist(),
+                        "text_mask_rle": {
+                            "size": text_mask_rle["size"],
+                            "counts": text_mask_rle["counts"].tolist(),
+                        },
+                    },
+                    f,
+                )
+        else:
+            np.savez_compressed(
+                export_path,
+                image_size=np.array(image.shape[:2]),
+                regions=regions_array,
+                text_mask_size=np.array(text_mask_rle["size"]),
+                text_mask_counts=text_mask_rle["counts"],
+            )
+        logging.info(f"Text regions saved at {export_path}")
+
+        crops = self.crop_regions(image, regions)
+        if self.save_crops and crops:
+            crops_dir = output_prefix
+            ensure_directory(crops_dir)
+            for i, crop in enumerate(crops):
+                cv2.imwrite(os.path.join(crops_dir, f"region_{i:04d}.png"), crop)
+            logging.info(f"Saved {len(crops)} region crops in {crops_dir}")
+
+        return {"regions": regions, "text_mask_rle": text_mask_rle, "crops": crops}
+
+    @classmethod
+    def remove_outputs(cls, output_dir, image_name):
+        """
+        Remove everything `apply` wrote for an image, in any export format.
+
+        Args:
+            output_dir: Directory the export was written to.
+            image_name: Base name of the processed image.
+        """
+        output_prefix = os.path.join(output_dir, f"{image_name}_text_regions")
+        for export_format in cls.FORMATS:
+            if os.path.exists(f"{output_prefix}.{export_format}"):
+                os.remove(f"{output_prefix}.{export_format}")
+        shutil.rmtree(output_prefix, ignore_errors=True)
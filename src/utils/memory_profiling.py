@@ -0,0 +1,228 @@
+import json
+import logging
+import os
+import tracemalloc
+from contextlib import contextmanager
+
+# Profiler receiving the checkpoints, tracemalloc is process-wide so there is only one at a time
+_active_profiler = None
+
+# Memory peaks a budget can be enforced on
+BUDGET_KINDS = ("rss", "traced")
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """Raised when an image needs more memory than its budget."""
+
+
+def current_rss():
+    """
+    Get the current resident set size of the process in bytes, or None if it can't be read.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def reset_peak_rss():
+    """
+    Reset the peak resident set size of the process to its current value (Linux only).
+
+    Returns:
+        True if the peak was reset, False if it isn't supported.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss():
+    """
+    Get the peak resident set size of the process since the last `reset_peak_rss` in bytes, or None
+    if it can't be read.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def memory_checkpoint(name, step_number=None):
+    """
+    Close the current profiling segment under the given name, if a profiler is active.
+
+    Args:
+        name: Name of the step that just finished.
+        step_number: Pipeline step the segment belongs to.
+    """
+    if _active_profiler is not None:
+        _active_profiler.checkpoint(name, step_number)
+
+
+def _to_mb(size):
+    return None if size is None else round(size / 2**20, 2)
+
+
+class MemoryProfiler:
+    def __init__(self, budget_mb=None, budget_kind="rss"):
+        """
+        Record RSS and tracemalloc peaks (which include NumPy and OpenCV output arrays) between
+        checkpoints, i.e. for every pipeline step and sub-step. The RSS peaks are only recorded
+        where they can be reset between segments (Linux).
+
+        Args:
+            budget_mb: Maximum memory peak allowed for an image, in MB.
+            budget_kind: Peak the budget applies to, "rss" or "traced". The RSS budget falls back to
+                the traced peak where RSS peaks aren't available.
+        """
+        if budget_kind not in BUDGET_KINDS:
+            raise ValueError(
+                f"Unknown memory budget kind '{budget_kind}', expected one of {BUDGET_KINDS}"
+            )
+        self.budget_mb = budget_mb
+        self.budget_kind = budget_kind
+        self.segments = []
+        self._rss_start = None
+        self._rss_peak_reset = False
+        self._traced_start = 0
+
+    @contextmanager
+    def activate(self):
+        """
+        Trace allocations and receive the checkpoints while the context is active.
+        """
+        global _active_profiler
+        if _active_profiler is not None:
+            raise RuntimeError("Another memory profiler is already active")
+
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        _active_profiler = self
+        self._start_segment()
+        try:
+            yield self
+        finally:
+            self.checkpoint("finalize")
+            _active_profiler = None
+            if not was_tracing:
+                tracemalloc.stop()
+
+    def _start_segment(self):
+        tracemalloc.reset_peak()
+        self._traced_start = tracemalloc.get_traced_memory()[0]
+        self._rss_peak_reset = reset_peak_rss()
+        self._rss_start = current_rss()
+
+    def checkpoint(self, name, step_number=None):
+        """
+        Record the memory used since the previous checkpoint and start a new segment.
+
+        Args:
+            name: Name of the step that just finished.
+            step_number: Pipeline step the segment belongs to.
+        """
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        rss = current_rss()
+        segment = {
+            "step": step_number,
+            "name": name,
+            "traced_peak_mb": _to_mb(traced_peak),
+            "traced_delta_mb": _to_mb(traced - self._traced_start),
+            "rss_mb": _to_mb(rss),
+            "rss_delta_mb": (
+                None
+                if rss is None or self._rss_start is None
+                else _to_mb(rss - self._rss_start)
+            ),
+        }
+        # Without a reset, the RSS peak would be the lifetime peak of the process
+        rss_peak = peak_rss() if self._rss_peak_reset else None
+        if rss_peak is not None:
+            segment["rss_peak_mb"] = _to_mb(rss_peak)
+        self.segments.append(segment)
+        self._start_segment()
+
+    def peak_mb(self, kind="traced"):
+        """
+        Get the highest memory peak over all segments, in MB.
+
+        Args:
+            kind: "traced" or "rss".
+
+        Returns:
+            The peak, or None for "rss" if no segment recorded an RSS peak.
+        """
+        peaks = [s[f"{kind}_peak_mb"] for s in self.segments if f"{kind}_peak_mb" in s]
+        if kind == "rss":
+            return max(peaks, default=None)
+        return max(peaks, default=0)
+
+    def budget_peak(self):
+        """
+        Get the metric the budget applies to and its peak, in MB.
+        """
+        if self.budget_kind == "rss":
+            rss_peak = self.peak_mb("rss")
+            if rss_peak is not None:
+                return "RSS", rss_peak
+        return "traced", self.peak_mb("traced")
+
+    def summary(self):
+        """
+        Summarize the segments per pipeline step.
+
+        Returns:
+            Dictionary with the overall peaks, the per-step peaks and the individual segments.
+        """
+        steps = {}
+        for segment in self.segments:
+            key = (
+                str(segment["step"]) if segment["step"] is not None else segment["name"]
+            )
+            steps[key] = max(steps.get(key, 0), segment["traced_peak_mb"])
+        summary = {"traced_peak_mb": self.peak_mb()}
+        rss_peak = self.peak_mb("rss")
+        if rss_peak is not None:
+            summary["rss_peak_mb"] = rss_peak
+        summary.update(
+            {
+                "budget_mb": self.budget_mb,
+                "budget_kind": self.budget_kind,
+                "steps_traced_peak_mb": steps,
+                "segments": self.segments,
+            }
+        )
+        return summary
+
+    def save(self, output_path):
+        """
+        Save the summary as JSON.
+
+        Args:
+            output_path: Path to the JSON file.
+        """
+        with open(output_path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        logging.info(f"Memory profile saved at {output_path}")
+
+    def check_budget(self):
+        """
+        Raise MemoryBudgetExceeded if the peak the budget applies to is over the budget.
+        """
+        if self.budget_mb is None:
+            return
+        metric, peak = self.budget_peak()
+        if peak > self.budget_mb:
+            raise MemoryBudgetExceeded(
+                f"{metric} memory peak of {peak} MB exceeds the budget of {self.budget_mb} MB"
+            )
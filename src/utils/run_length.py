@@ -0,0 +1,39 @@
+import numpy as np
+
+
+def rle_encode(mask):
+    """
+    Run-length encode a binary mask in column-major order, like COCO's uncompressed RLE.
+
+    The counts alternate between background and foreground runs, always starting with a
+    (possibly empty) background run.
+
+    Args:
+        mask: 2D numpy array, non-zero values are foreground.
+
+    Returns:
+        Dictionary with "size" as [height, width] and "counts" as a numpy array of run lengths.
+    """
+    flat = mask.ravel(order="F") > 0
+    change_points = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    boundaries = np.concatenate(([0], change_points, [flat.size]))
+    counts = np.diff(boundaries)
+    if flat.size and flat[0]:
+        counts = np.concatenate(([0], counts))
+    return {"size": [int(mask.shape[0]), int(mask.shape[1])], "counts": counts}
+
+
+def rle_decode(rle):
+    """
+    Decode a run-length encoded mask produced by `rle_encode`.
+
+    Args:
+        rle: Dictionary with "size" and "counts".
+
+    Returns:
+        Binary mask as a uint8 numpy array with 255 for foreground.
+    """
+    counts = np.asarray(rle["counts"], dtype=np.int64)
+    values = np.zeros(len(counts), dtype=np.uint8)
+    values[1::2] = 255
+    return np.repeat(values, counts).reshape(rle["size"], order="F")
@@ -0,0 +1,28 @@
+import numpy as np
+
+from src.utils.run_length import rle_decode, rle_encode
+
+
+def test_round_trip_foreground_first():
+    mask = np.zeros((3, 4), dtype=np.uint8)
+    mask[0, 0] = 255
+    mask[1:, 2:] = 255
+    rle = rle_encode(mask)
+    assert rle["size"] == [3, 4]
+    # Column-major: the first pixel is foreground, so the counts start with an empty background run
+    assert rle["counts"].tolist() == [0, 1, 6, 2, 1, 2]
+    np.testing.assert_array_equal(rle_decode(rle), mask)
+
+
+def test_round_trip_all_zero():
+    mask = np.zeros((5, 2), dtype=np.uint8)
+    rle = rle_encode(mask)
+    assert rle["counts"].tolist() == [10]
+    np.testing.assert_array_equal(rle_decode(rle), mask)
+
+
+def test_round_trip_empty():
+    mask = np.zeros((0, 3), dtype=np.uint8)
+    rle = rle_encode(mask)
+    assert rle["size"] == [0, 3]
+    assert rle_decode(rle).shape == (0, 3)